@@ -1,13 +1,20 @@
 import argparse
-import bs4
 import datetime
+import functools
+import itertools
+import lxml.etree
+import lxml.html
 import os
+import queue
 import re
 import requests
+import shutil
 import sqlite3
 import subprocess
 import sys
+import threading
 import types
+import urllib3
 
 from voussoirkit import betterhelp
 from voussoirkit import pathclass
@@ -27,6 +34,8 @@ CATEGORIES = [
     'backgrounds',
 ]
 
+# The id column is the primary key, which SQLite already indexes. Older
+# databases had a second index on it that only slowed down every write.
 DB_INIT = '''
 BEGIN;
 CREATE TABLE IF NOT EXISTS sticks(
@@ -43,13 +52,29 @@ CREATE TABLE IF NOT EXISTS sticks(
     usage_rating TEXT,
     retrieved INT
 );
-CREATE INDEX IF NOT EXISTS index_sticks_id ON sticks(id);
+DROP INDEX IF EXISTS index_sticks_id;
 COMMIT;
 '''
 
+# page_size only takes effect when the database file is first created, so it
+# has to come before journal_mode. The mmap_size of 256 MiB is a reservation
+# of address space, not resident memory.
+DB_PRAGMAS = '''
+PRAGMA page_size = 8192;
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -65536;
+PRAGMA mmap_size = 268435456;
+'''
+
 SQL_COLUMNS = sqlhelpers.extract_table_column_map(DB_INIT)
 
+# RETURNING clauses were added in SQLite 3.35.
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 sql = sqlite3.connect('sticks.db')
+sql.executescript(DB_PRAGMAS)
 sql.executescript(DB_INIT)
 
 
@@ -64,14 +89,56 @@ HEADERS = {
 
 session = requests.Session()
 session.headers.update(HEADERS)
+# Everything comes from one host, so the pool only needs to be big enough for
+# the --threads that people actually use.
+SESSION_ADAPTER = requests.adapters.HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=urllib3.Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+)
+session.mount('http://', SESSION_ADAPTER)
+session.mount('https://', SESSION_ADAPTER)
+
+# Seconds to wait for the connection, and then between bytes of the response,
+# before giving up. SESSION_ADAPTER retries timeouts that happen before the
+# response headers arrive.
+REQUEST_TIMEOUT = 30
+
+# While scraping, sticks are written and committed in batches of this many
+# rows. Each row binds 12 parameters and older SQLite builds only allow 999
+# parameters per statement.
+INSERT_BATCH_SIZE = 80
 
 DOWNLOAD_RATELIMITER = ratelimiter.Ratelimiter(allowance=1, period=5)
 
 WINRAR = winwhich.which('winrar')
 
+DOWNLOAD_FILENAME_REGEX = re.compile(r'file=(.+)')
+STICK_INFO_REGEX = re.compile(
+    r'(?:'
+    r'Vote Score: (?P<vote_score>[-\d]+)'
+    r'|Downloads: (?P<downloads>\d+)'
+    r'|Category: (?P<category>.+?)'
+    r'|Version: (?P<version>.+?)'
+    r'|Usage Rating: (?P<usage_rating>.+?)'
+    r'|Date Submitted: (?P<date>.+?)'
+    r')\s*$',
+    flags=re.M,
+)
+
 def get_now():
     return datetime.datetime.now(datetime.timezone.utc).timestamp()
 
+@functools.lru_cache(maxsize=4096)
+def parse_date(date):
+    '''
+    Convert a date like "January 31, 2010" to a UTC timestamp. Lots of sticks
+    share the same submission date, so the results are cached.
+    '''
+    date = datetime.datetime.strptime(date, '%B %d, %Y')
+    date = date.replace(tzinfo=datetime.timezone.utc)
+    return date.timestamp()
+
 def id_from_direct_url(direct_url):
     id = direct_url.split('/direct/')[-1]
     id = id.split('/')[0].split('?')[0]
@@ -84,98 +151,210 @@ def select_stick(id):
     cur.execute('SELECT * FROM sticks WHERE id == ?', [id])
     return cur.fetchone()
 
-def insert_id(id, commit=True):
-    cur = sql.cursor()
-    cur.execute('SELECT 1 FROM sticks WHERE id == ?', [id])
-    existing = cur.fetchone()
-    if not existing:
-        data = {'id': id}
-        columns = SQL_COLUMNS['sticks']
-        (qmarks, bindings) = sqlhelpers.insert_filler(data)
+def select_ids():
+    '''
+    Return the set of all ids in the database. When many ids are about to be
+    checked, load this once and pass it to insert_id / insert_ids so they
+    don't have to query for every id.
+    '''
+    cur = sql.execute('SELECT id FROM sticks')
+    return {row[0] for row in cur.fetchall()}
 
-        query = f'INSERT INTO sticks {qmarks}'
-        cur.execute(query, bindings)
+def insert_id(id, commit=True, known_ids=None, cur=None):
+    if cur is None:
+        cur = sql.cursor()
 
-        if commit:
-            sql.commit()
+    if known_ids is not None:
+        is_new = id not in known_ids
+        if is_new:
+            cur.execute('INSERT OR IGNORE INTO sticks(id) VALUES(?)', [id])
+            known_ids.add(id)
 
-    status = types.SimpleNamespace(id=id, is_new=not existing)
-    return status
+    elif SQLITE_HAS_RETURNING:
+        # A row only comes back if the insert wasn't ignored, so this checks
+        # and inserts in one statement.
+        cur.execute('INSERT OR IGNORE INTO sticks(id) VALUES(?) RETURNING id', [id])
+        is_new = cur.fetchone() is not None
 
-def insert_ids(ids, commit=True):
-    for id in ids:
-        insert_id(id, commit=False)
+    else:
+        cur.execute('SELECT 1 FROM sticks WHERE id == ?', [id])
+        is_new = cur.fetchone() is None
+        if is_new:
+            cur.execute('INSERT OR IGNORE INTO sticks(id) VALUES(?)', [id])
 
-    if commit:
+    if is_new and commit:
         sql.commit()
 
-def insert_stick(data, commit=True):
-    cur = sql.cursor()
+    status = types.SimpleNamespace(id=id, is_new=is_new)
+    return status
 
-    cur.execute('SELECT 1 FROM sticks WHERE id == ?', [data['id']])
-    existing = cur.fetchone()
-    if existing:
-        (qmarks, bindings) = sqlhelpers.update_filler(data, 'id')
-        query = f'UPDATE sticks {qmarks}'
-    else:
-        (qmarks, bindings) = sqlhelpers.insert_filler(data)
-        query = f'INSERT INTO sticks {qmarks}'
+def insert_ids(ids, commit=True, known_ids=None):
+    if known_ids is not None:
+        ids = [id for id in ids if id not in known_ids]
+        known_ids.update(ids)
 
-    cur.execute(query, bindings)
+    # The primary key takes care of ids that are already in the table.
+    query = 'INSERT OR IGNORE INTO sticks(id) VALUES(?)'
+    sql.executemany(query, ((id,) for id in ids))
 
     if commit:
         sql.commit()
 
+def insert_stick(data, commit=True, cur=None):
+    insert_stick_batch([data], cur=cur)
+
+    if commit:
+        sql.commit()
+
+def insert_stick_batch(datas, cur=None):
+    '''
+    Insert or update all of these sticks with a single multi-row statement.
+    All of the datas must have the same keys.
+    '''
+    columns = list(datas[0].keys())
+    row_qmarks = '(' + ', '.join(['?'] * len(columns)) + ')'
+    all_qmarks = ', '.join([row_qmarks] * len(datas))
+    updates = ', '.join(
+        f'{column} = excluded.{column}'
+        for column in columns
+        if column != 'id'
+    )
+    conflict = f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+    query = f'''
+    INSERT INTO sticks({', '.join(columns)}) VALUES {all_qmarks}
+    ON CONFLICT(id) {conflict}
+    '''
+    bindings = [data[column] for data in datas for column in columns]
+
+    if cur is None:
+        cur = sql.cursor()
+    cur.execute(query, bindings)
+
 def insert_sticks(datas, commit=True):
-    for data in datas:
-        insert_stick(data, commit=False)
+    cur = sql.cursor()
+    batch = []
+    try:
+        for data in datas:
+            batch.append(data)
+            if len(batch) < INSERT_BATCH_SIZE:
+                continue
+            # Swap the batch out before inserting, so that if the insert itself
+            # fails the finally below doesn't repeat it and hide the error.
+            (full_batch, batch) = (batch, [])
+            insert_stick_batch(full_batch, cur=cur)
+            if commit:
+                sql.commit()
+    finally:
+        # If the datas generator is interrupted, we still want to keep the
+        # sticks that were scraped so far.
+        if batch:
+            insert_stick_batch(batch, cur=cur)
 
     if commit:
         sql.commit()
 
 # SCRAPE
 ################################################################################
-def request(url):
+def request(url, stream=False):
     print(url)
-    response = session.get(url)
+    response = session.get(url, stream=stream, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     return response
 
+def parse_html(response):
+    '''
+    Return the lxml tree of this response's HTML. If the Content-Type header
+    names a charset, lxml is told to use it, because on its own lxml only
+    looks at <meta> tags and otherwise falls back to latin-1.
+    '''
+    content_type = response.headers.get('Content-Type', '').lower()
+    if 'charset' in content_type:
+        parser = lxml.html.HTMLParser(encoding=response.encoding)
+    else:
+        parser = None
+    return lxml.html.fromstring(response.content, parser=parser)
+
+def ids_from_directs(element):
+    '''
+    Return the Stick IDs of all the /direct/ links within this element.
+    '''
+    # The substring test happens inside libxml2, so the only thing left to
+    # check in Python is that the link is followed by a numeric ID.
+    hrefs = element.xpath('.//a[contains(@href, "/direct/")]/@href')
+    ids = [id_from_direct_url(href) for href in hrefs]
+    ids = [id for id in ids if id[:1].isdigit()]
+    return ids
+
+def has_ancestor_classes(element, *classes):
+    '''
+    Return True if the element is nested inside elements with these classes,
+    outermost first. has_ancestor_classes(h2, 'section', 'top') is the
+    equivalent of the CSS selector `.section .top h2`.
+    '''
+    wanted = list(classes)
+    for ancestor in element.iterancestors():
+        if not wanted:
+            break
+        if wanted[-1] in (ancestor.get('class') or '').split():
+            wanted.pop()
+    return not wanted
+
 def scrape_direct(id, commit=True):
     '''
     Return the dict of Stick data for this ID.
     '''
     url = f'http://droidz.org/direct/{id}'
     response = request(url)
-    text = response.text
-
-    # I had a weird issue where some brs were not self-closing and they
-    # contained a bunch of other elements. This whitespace replacement fixed
-    # the issue but I didn't quite understand why.
-    text = re.sub(r'<\s*br\s*/\s*>', '<br/>', text)
-    soup = bs4.BeautifulSoup(text, 'html.parser')
-
-    for br in soup.find_all('br'):
-        br.replace_with('\n')
-
-    stick_info = soup.select('.content')[1].get_text()
-    author = soup.find('a', href=re.compile(r'search\.php\?searchq=')).get_text()
-    vote_score = int(re.search(r'Vote Score: ([-\d]+)\s*$', stick_info, flags=re.M).group(1))
-    downloads = int(re.search(r'Downloads: (\d+)\s*$', stick_info, flags=re.M).group(1))
-    category = re.search(r'Category: (.+?)\s*$', stick_info, flags=re.M).group(1)
-    version = re.search(r'Version: (.+?)\s*$', stick_info, flags=re.M).group(1)
-    usage_rating = re.search(r'Usage Rating: (.+?)\s*$', stick_info, flags=re.M).group(1)
-    date = re.search(r'Date Submitted: (.+?)\s*$', stick_info, flags=re.M).group(1)
-    date = datetime.datetime.strptime(date, '%B %d, %Y')
-    date = date.timestamp()
-
-    name = soup.select_one('.section .top h2').get_text().strip()
-    description = soup.select_one('.section .content').get_text().strip()
+    tree = parse_html(response)
+
+    # Collect everything we need in a single walk over the tree instead of
+    # running a separate search for each piece.
+    contents = []
+    author = None
+    download_link = None
+    name = None
+    description = None
+    for element in tree.iter(lxml.etree.Element):
+        tag = element.tag
+        if tag == 'br':
+            element.tail = '\n' + (element.tail or '')
+            continue
+
+        if tag == 'a':
+            href = element.get('href') or ''
+            if author is None and 'search.php?searchq=' in href:
+                author = element
+            elif download_link is None and '/resources/grab.php?file=' in href:
+                download_link = href
+
+        elif tag == 'h2':
+            if name is None and has_ancestor_classes(element, 'section', 'top'):
+                name = element
+
+        if 'content' in (element.get('class') or '').split():
+            contents.append(element)
+            if description is None and has_ancestor_classes(element, 'section'):
+                description = element
+
+    # The br tails have to be fixed up before any text is read.
+    stick_info = contents[1].text_content()
+    author = author.text_content()
+    fields = {}
+    for match in STICK_INFO_REGEX.finditer(stick_info):
+        fields.setdefault(match.lastgroup, match.group(match.lastgroup))
+    vote_score = int(fields['vote_score'])
+    downloads = int(fields['downloads'])
+    category = fields['category']
+    version = fields['version']
+    usage_rating = fields['usage_rating']
+    date = parse_date(fields['date'])
+
+    name = name.text_content().strip()
+    description = description.text_content().strip()
     if description == f'{author}, has left no comments for this submission.':
         description = None
     else:
         description = description.replace(f'{author} says, ', '')
-    download_link = soup.find('a', href=re.compile(r'/resources/grab\.php\?file='))['href']
     retrieved = int(get_now())
 
     data = {
@@ -195,6 +374,37 @@ def scrape_direct(id, commit=True):
 
     return data
 
+def put_unless_stopped(results, item, stop):
+    '''
+    Put the item into the results queue, waiting for room as long as the stop
+    event is not set. Return True if the item was put.
+    '''
+    while not stop.is_set():
+        try:
+            results.put(item, timeout=1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def scrape_directs_to_queue(ids, results, stop):
+    '''
+    Put the Stick data for each of these IDs into the results queue, followed
+    by None when finished. If a scrape fails, its exception is put into the
+    queue instead and no more IDs are scraped.
+
+    The consumer sets the stop event when it is no longer reading the queue,
+    and then this function returns as soon as the current scrape is done.
+    '''
+    try:
+        for id in ids:
+            if not put_unless_stopped(results, scrape_direct(id), stop):
+                return
+    except BaseException as exc:
+        put_unless_stopped(results, exc, stop)
+        return
+    put_unless_stopped(results, None, stop)
+
 def scrape_directs(ids, threads=1, commit=True):
     '''
     Given many Stick IDs, yield Stick datas.
@@ -203,8 +413,26 @@ def scrape_directs(ids, threads=1, commit=True):
         raise ValueError(threads)
 
     if threads == 1:
-        for id in ids:
-            yield scrape_direct(id)
+        # Scrape on a background thread so that the next page is downloading
+        # while the caller is writing the previous results to the database.
+        results = queue.Queue(maxsize=8)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=scrape_directs_to_queue,
+            args=[ids, results, stop],
+            daemon=True,
+        )
+        producer.start()
+        try:
+            while True:
+                result = results.get()
+                if result is None:
+                    break
+                if isinstance(result, BaseException):
+                    raise result
+                yield result
+        finally:
+            stop.set()
 
     else:
         pool = threadpool.ThreadPool(size=threads)
@@ -218,26 +446,65 @@ def scrape_directs(ids, threads=1, commit=True):
                 raise job.exception
             yield job.value
 
-def scrape_category(category):
+def scrape_category_page(category, page):
+    '''
+    Return the list of Stick IDs on this page of the category.
+    '''
+    url = f'http://droidz.org/stickmain/{category}.php?page={page}'
+    response = request(url)
+    tree = parse_html(response)
+    return ids_from_directs(tree)
+
+def scrape_category_pages(category, threads=1):
+    '''
+    Yield the list of Stick IDs from each page of this category, in page
+    order, without end. The caller decides when to stop.
+
+    With more than one thread, pages are requested `threads` at a time so a
+    few requests past the end will be wasted.
+    '''
+    if threads < 1:
+        raise ValueError(threads)
+
+    if threads == 1:
+        for page in itertools.count(1):
+            yield scrape_category_page(category, page)
+
+    else:
+        pool = threadpool.ThreadPool(size=threads)
+        try:
+            for page in itertools.count(1, threads):
+                kwargss = [
+                    {'function': scrape_category_page, 'args': [category, p], 'name': p}
+                    for p in range(page, page + threads)
+                ]
+                pool.add_many(kwargss)
+                for job in pool.result_generator():
+                    if job.exception:
+                        raise job.exception
+                    yield job.value
+        finally:
+            # close does not block. Any jobs left over from the last batch
+            # finish in the background, and then the threads exit.
+            pool.close()
+
+def scrape_category(category, threads=1):
     '''
     Yield Stick IDs from all pages within this category. They are listed in
     alphabetical order by Stick name.
+
+    The site doesn't tell us how many pages there are, so we stop at the first
+    page that has nothing new.
     '''
-    page = 1
-    all_directs = set()
-    while True:
-        url = f'http://droidz.org/stickmain/{category}.php?page={page}'
-        response = request(url)
-        soup = bs4.BeautifulSoup(response.text, 'html.parser')
-        this_directs = soup.find_all('a', href=re.compile(r'/direct/\d+'))
-        prev_count = len(all_directs)
-        all_directs.update(this_directs)
-        if len(all_directs) == prev_count:
+    all_ids = set()
+    pages = scrape_category_pages(category, threads=threads)
+    for this_ids in pages:
+        prev_count = len(all_ids)
+        all_ids.update(this_ids)
+        if len(all_ids) == prev_count:
             break
-        page += 1
-        for direct in this_directs:
-            id = id_from_direct_url(direct['href'])
-            yield id
+        yield from this_ids
+    pages.close()
 
 def scrape_latest():
     '''
@@ -245,32 +512,29 @@ def scrape_latest():
     '''
     url = 'http://droidz.org/stickmain/'
     response = request(url)
-    soup = bs4.BeautifulSoup(response.text, 'html.parser')
-    h2s = soup.find_all('h2')
-    for h2 in h2s:
-        if 'Latest 50 Accepted' in h2.get_text():
-            latest_50_h2 = h2
-            break
+    tree = parse_html(response)
+    latest_50_h2 = tree.xpath('//h2[contains(., "Latest 50 Accepted")]')[0]
 
-    div = latest_50_h2.parent
-    directs = div.find_all('a', href=re.compile(r'/direct/\d+'))
-    for direct in directs:
-        id = id_from_direct_url(direct['href'])
-        yield id
+    div = latest_50_h2.getparent()
+    yield from ids_from_directs(div)
 
 # UPDATE
 ################################################################################
 def incremental_update(threads=1):
     latest_ids = scrape_latest()
+    # There are only 50 of these, so no known_ids set. Each insert_id is a
+    # single INSERT OR IGNORE ... RETURNING where SQLite supports it.
+    cur = sql.cursor()
     for id in latest_ids:
-        status = insert_id(id, commit=False)
+        status = insert_id(id, commit=False, cur=cur)
 
     if status.is_new:
         print('The Latest box didn\'t contain everything.')
         print('Need to check the categories for new sticks.')
+        known_ids = select_ids()
         for category in CATEGORIES:
-            ids = scrape_category(category)
-            insert_ids(ids)
+            ids = scrape_category(category, threads=threads)
+            insert_ids(ids, known_ids=known_ids)
     else:
         print('No new sticks for incremental update.')
 
@@ -284,9 +548,10 @@ def incremental_update(threads=1):
         sql.commit()
 
 def full_update(threads=1):
+    known_ids = select_ids()
     for category in CATEGORIES:
-        ids = scrape_category(category)
-        insert_ids(ids)
+        ids = scrape_category(category, threads=threads)
+        insert_ids(ids, known_ids=known_ids)
 
     cur = sql.cursor()
     cur.execute('SELECT id FROM sticks ORDER BY retrieved ASC')
@@ -300,23 +565,35 @@ def full_update(threads=1):
 
 # DOWNLOAD
 ################################################################################
-def download_stick(id, overwrite=False, extract=False):
+def download_stick(id, overwrite=False, extract=False, download_link=None):
     directory = pathclass.Path('download').with_child(id)
     if directory.exists and not overwrite:
         return directory
 
-    cur = sql.execute('SELECT download_link FROM sticks WHERE id == ?', [id])
-    download_link = cur.fetchone()[0]
-    filename = re.search(r'file=(.+)', download_link).group(1)
+    if download_link is None:
+        cur = sql.execute('SELECT download_link FROM sticks WHERE id == ?', [id])
+        download_link = cur.fetchone()[0]
+    filename = DOWNLOAD_FILENAME_REGEX.search(download_link).group(1)
     filepath = directory.with_child(filename)
 
     DOWNLOAD_RATELIMITER.limit()
     print(f'Downloading {id}')
-    response = request(download_link)
-
-    directory.makedirs(exist_ok=True)
-    with filepath.open('wb') as handle:
-        handle.write(response.content)
+    # The existence of the directory is what marks a stick as downloaded, so
+    # an interrupted transfer must not leave it behind.
+    part_path = filepath.absolute_path + '.part'
+    with request(download_link, stream=True) as response:
+        response.raw.decode_content = True
+        directory.makedirs(exist_ok=True)
+        try:
+            with open(part_path, 'wb') as handle:
+                shutil.copyfileobj(response.raw, handle, length=2 ** 20)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            if not os.listdir(directory.absolute_path):
+                os.rmdir(directory.absolute_path)
+            raise
+    os.replace(part_path, filepath.absolute_path)
 
     if extract and WINRAR is not None and filepath.extension == 'zip':
         # As much as I would like to use Python's zipfile module, I found that
@@ -333,12 +610,41 @@ def download_stick(id, overwrite=False, extract=False):
 
     return directory
 
-def download_all(overwrite=False, extract=False):
+def download_all(overwrite=False, extract=False, threads=1):
+    if threads < 1:
+        raise ValueError(threads)
+
+    # The sqlite connection can't be used from the worker threads, so the
+    # download links are looked up here and handed to download_stick.
     cur = sql.cursor()
-    cur.execute('SELECT id FROM sticks')
-    ids = [row[0] for row in cur.fetchall()]
-    for id in ids:
-        download_stick(id, overwrite=overwrite, extract=extract)
+    cur.execute('SELECT id, download_link FROM sticks WHERE download_link IS NOT NULL')
+    rows = cur.fetchall()
+    if not rows:
+        return
+
+    if threads == 1:
+        for (id, download_link) in rows:
+            download_stick(id, overwrite=overwrite, extract=extract, download_link=download_link)
+
+    else:
+        pool = threadpool.ThreadPool(size=threads)
+        kwargss = [
+            {
+                'function': download_stick,
+                'args': [id],
+                'kwargs': {
+                    'overwrite': overwrite,
+                    'extract': extract,
+                    'download_link': download_link,
+                },
+                'name': id,
+            }
+            for (id, download_link) in rows
+        ]
+        pool.add_many(kwargss)
+        for job in pool.result_generator():
+            if job.exception:
+                raise job.exception
 
 # COMMAND LINE
 ################################################################################
@@ -353,7 +659,11 @@ def download_argparse(args):
     if args.extract and not WINRAR:
         raise Exception('The --extract flag requires you to have winrar on your path.')
     if len(args.ids) == 1 and args.ids[0] == 'all':
-        return download_all(overwrite=args.overwrite, extract=args.extract)
+        return download_all(
+            overwrite=args.overwrite,
+            extract=args.extract,
+            threads=args.threads,
+        )
     else:
         for id in args.ids:
             return download_stick(id, overwrite=args.overwrite, extract=args.extract)
@@ -394,6 +704,7 @@ def main(argv):
     )
     p_download.examples = [
         'all',
+        'all --threads 4',
         '100 200 300 --overwrite',
     ]
     p_download.add_argument(
@@ -424,6 +735,16 @@ def main(argv):
         Sorry.
         ''',
     )
+    p_download.add_argument(
+        '--threads',
+        dest='threads',
+        type=int,
+        default=1,
+        help='''
+        Download this many sticks at a time when downloading "all". The
+        download ratelimit is shared between the threads.
+        ''',
+    )
     p_download.set_defaults(func=download_argparse)
 
     return betterhelp.go(parser, argv)